@@ -6,36 +6,55 @@ from dotenv import load_dotenv
 load_dotenv()
 
 class Settings:
-    """Application settings loaded from environment variables."""
-    
-    # API Configuration
-    API_KEY: str = os.getenv("API_KEY", "default_api_key")
-    CHROME_EXTENSION_ID: str = os.getenv("CHROME_EXTENSION_ID", "default_extension_id")
-    
-    # Redis Configuration
-    REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
-    REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
-    REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
-    REDIS_PASSWORD: Optional[str] = os.getenv("REDIS_PASSWORD")
-    
-    # Google Fact Check API
-    GOOGLE_FACT_CHECK_API_KEY: Optional[str] = os.getenv("GOOGLE_FACT_CHECK_API_KEY")
-    
-    # Model Configuration
-    MODEL_NAME: str = os.getenv("MODEL_NAME", "distilbert-base-uncased-finetuned-fake-news")
-    CACHE_TTL_HOURS: int = int(os.getenv("CACHE_TTL_HOURS", "24"))
-    API_CACHE_TTL_HOURS: int = int(os.getenv("API_CACHE_TTL_HOURS", "1"))
-    
-    # Rate Limiting
-    RATE_LIMIT_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_PER_MINUTE", "10"))
-    REQUEST_TIMEOUT_SECONDS: int = int(os.getenv("REQUEST_TIMEOUT_SECONDS", "5"))
-    
-    # CORS Configuration
-    ALLOWED_ORIGINS: list = [
-        f"chrome-extension://{os.getenv('CHROME_EXTENSION_ID', 'default_extension_id')}",
-        "http://localhost:3000",  # For development
-        "http://localhost:8000"   # For development
-    ]
+    """Application settings loaded once from environment variables.
+
+    __slots__ keeps the hot-path reads (rate limits, TTLs, timeouts)
+    C-level slot loads instead of __dict__ lookups.
+    """
+
+    __slots__ = (
+        "API_KEY", "CHROME_EXTENSION_ID",
+        "REDIS_HOST", "REDIS_PORT", "REDIS_DB", "REDIS_PASSWORD",
+        "GOOGLE_FACT_CHECK_API_KEY",
+        "MODEL_NAME", "USE_ONNX_RUNTIME",
+        "MODEL_BATCH_SIZE", "MODEL_BATCH_TIMEOUT_MS",
+        "CACHE_TTL_HOURS", "API_CACHE_TTL_HOURS",
+        "RATE_LIMIT_PER_MINUTE", "REQUEST_TIMEOUT_SECONDS",
+        "ALLOWED_ORIGINS",
+    )
+
+    def __init__(self):
+        # API Configuration
+        self.API_KEY: str = os.getenv("API_KEY", "default_api_key")
+        self.CHROME_EXTENSION_ID: str = os.getenv("CHROME_EXTENSION_ID", "default_extension_id")
+
+        # Redis Configuration
+        self.REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
+        self.REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
+        self.REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
+        self.REDIS_PASSWORD: Optional[str] = os.getenv("REDIS_PASSWORD")
+
+        # Google Fact Check API
+        self.GOOGLE_FACT_CHECK_API_KEY: Optional[str] = os.getenv("GOOGLE_FACT_CHECK_API_KEY")
+
+        # Model Configuration
+        self.MODEL_NAME: str = os.getenv("MODEL_NAME", "distilbert-base-uncased-finetuned-fake-news")
+        self.USE_ONNX_RUNTIME: bool = os.getenv("USE_ONNX_RUNTIME", "false").lower() == "true"
+        self.MODEL_BATCH_SIZE: int = int(os.getenv("MODEL_BATCH_SIZE", "8"))
+        self.MODEL_BATCH_TIMEOUT_MS: int = int(os.getenv("MODEL_BATCH_TIMEOUT_MS", "10"))
+        self.CACHE_TTL_HOURS: int = int(os.getenv("CACHE_TTL_HOURS", "24"))
+        self.API_CACHE_TTL_HOURS: int = int(os.getenv("API_CACHE_TTL_HOURS", "1"))
+
+        # Rate Limiting
+        self.RATE_LIMIT_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_PER_MINUTE", "10"))
+        self.REQUEST_TIMEOUT_SECONDS: int = int(os.getenv("REQUEST_TIMEOUT_SECONDS", "5"))
+
+        # CORS Configuration (derived from the already-read extension id)
+        self.ALLOWED_ORIGINS: list = [
+            f"chrome-extension://{self.CHROME_EXTENSION_ID}",
+            "http://localhost:3000",  # For development
+            "http://localhost:8000"   # For development
+        ]
 
 # Global settings instance
 settings = Settings()
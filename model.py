@@ -1,20 +1,62 @@
 import asyncio
+import logging
+import os
 import re
 from typing import Dict, List, Optional, Tuple
-from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import torch
 from config import settings
 from cache import cache
 
+logger = logging.getLogger(__name__)
+
+# This service never trains; turn autograd off once for the process
+torch.set_grad_enabled(False)
+
+# Cap intra-op threads so concurrent uvicorn workers don't oversubscribe
+# the cores and thrash caches; INFERENCE_THREADS x workers <= cores
+_inference_threads = int(os.environ.get(
+    'INFERENCE_THREADS', str(max(1, (os.cpu_count() or 2) // 2))
+))
+os.environ.setdefault('OMP_NUM_THREADS', str(_inference_threads))
+os.environ.setdefault('MKL_NUM_THREADS', str(_inference_threads))
+torch.set_num_threads(_inference_threads)
+try:
+    torch.set_num_interop_threads(1)
+except RuntimeError:
+    # Interop pool already started (e.g. under a test runner)
+    pass
+
+# Below this many characters the model has too little signal to beat the
+# pattern fallback, so skip the forward pass entirely
+MIN_MODEL_TEXT_LENGTH = 20
+
+# The model truncates at 512 tokens anyway; feeding the tokenizer more
+# than ~2KB of text is wasted work
+MAX_MODEL_TEXT_CHARS = 2048
+
+# Batches are padded up to one of these sequence lengths so the compiled
+# model replays a handful of cached specializations (CUDA graphs on GPU)
+# instead of recompiling for every distinct length
+LENGTH_BUCKETS = (64, 128, 256, 512)
+
 class FakeNewsDetector:
     """AI-powered fake news detection service using HuggingFace models."""
-    
+
+    # Sanitization patterns, compiled once; the tag/javascript/data
+    # removal is fused into one alternation so the text is walked a
+    # single time instead of three
+    _TAG_RE = re.compile(r'<[^>]*>|javascript:|data:', re.IGNORECASE)
+    _WS_RE = re.compile(r'\s+')
+
     def __init__(self):
         self.model = None
         self.tokenizer = None
-        self.pipeline = None
         self._model_loaded = False
         self._loading_lock = asyncio.Lock()
+        self._batch_queue: Optional[asyncio.Queue] = None
+        self._batch_task: Optional[asyncio.Task] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
         
         # Suspicious keywords and patterns
         self.suspicious_keywords = [
@@ -23,13 +65,28 @@ class FakeNewsDetector:
             'government lies', 'big pharma', 'deep state', 'illuminati',
             'vaccine autism', '5g coronavirus', 'flat earth', 'moon landing fake'
         ]
+
+        # One compiled alternation finds every keyword in a single linear
+        # scan instead of one substring pass per keyword; IGNORECASE
+        # means the text never needs a lowered copy. The zero-width
+        # lookahead keeps overlapping keywords (e.g. 'lies' inside
+        # 'government lies') matching like the old per-keyword scan.
+        self._keyword_pattern = re.compile(
+            '(?=(' + '|'.join(re.escape(keyword) for keyword in self.suspicious_keywords) + '))',
+            re.IGNORECASE
+        )
         
+        # Compiled once here; re-compiling (or re.cache lookups) per
+        # request is wasted work on the /analyze hot path
         self.suspicious_patterns = [
-            r'\b(?:100%|absolutely|definitely|proven|scientific)\s+(?:fact|truth|real)\b',
-            r'\b(?:mainstream|corporate|fake)\s+(?:media|news|scientists)\b',
-            r'\b(?:they|them|them)\s+(?:don\'t|won\'t|can\'t)\s+(?:want|let|tell)\s+(?:you|us)\b',
-            r'\b(?:wake\s+up|open\s+your\s+eyes|do\s+your\s+research)\b',
-            r'\b(?:sheeple|sheep|brainwashed|programmed)\b'
+            (pattern, re.compile(pattern, re.IGNORECASE))
+            for pattern in [
+                r'\b(?:100%|absolutely|definitely|proven|scientific)\s+(?:fact|truth|real)\b',
+                r'\b(?:mainstream|corporate|fake)\s+(?:media|news|scientists)\b',
+                r'\b(?:they|them|them)\s+(?:don\'t|won\'t|can\'t)\s+(?:want|let|tell)\s+(?:you|us)\b',
+                r'\b(?:wake\s+up|open\s+your\s+eyes|do\s+your\s+research)\b',
+                r'\b(?:sheeple|sheep|brainwashed|programmed)\b'
+            ]
         ]
     
     async def load_model(self):
@@ -42,61 +99,241 @@ class FakeNewsDetector:
                 return
             
             try:
-                print(f"🔄 Loading model: {settings.MODEL_NAME}")
-                
-                # Load tokenizer and model
-                self.tokenizer = AutoTokenizer.from_pretrained(settings.MODEL_NAME)
-                self.model = AutoModelForSequenceClassification.from_pretrained(settings.MODEL_NAME)
-                
-                # Create pipeline
-                self.pipeline = pipeline(
-                    "text-classification",
-                    model=self.model,
-                    tokenizer=self.tokenizer,
-                    device=0 if torch.cuda.is_available() else -1
-                )
-                
+                logger.info("Loading model: %s", settings.MODEL_NAME)
+
+                # Load tokenizer (fast Rust tokenizer for batch encoding)
+                self.tokenizer = AutoTokenizer.from_pretrained(settings.MODEL_NAME, use_fast=True)
+
+                # Prefer the ONNX Runtime path when enabled (fused
+                # attention/GELU kernels); fall back to PyTorch
+                if not (settings.USE_ONNX_RUNTIME and self._load_onnx_model()):
+                    self._load_torch_model()
+
                 self._model_loaded = True
-                print("✅ Model loaded successfully")
-                
-            except Exception as e:
-                print(f"❌ Model loading failed: {e}")
+                logger.info("Model loaded successfully")
+
+            except Exception:
+                logger.exception("Model loading failed")
                 # Fallback to a simpler approach if model loading fails
                 self._model_loaded = False
+
+    def _load_torch_model(self):
+        """Load the model through the standard PyTorch path."""
+        try:
+            # Fused scaled-dot-product attention: one kernel instead of
+            # matmul+softmax+matmul with intermediate writes
+            self.model = AutoModelForSequenceClassification.from_pretrained(
+                settings.MODEL_NAME,
+                attn_implementation="sdpa"
+            ).eval()
+        except (TypeError, ValueError) as e:
+            logger.warning("SDPA attention unavailable, using eager attention: %s", e)
+            self.model = AutoModelForSequenceClassification.from_pretrained(settings.MODEL_NAME).eval()
+
+        if torch.cuda.is_available():
+            # fp16 halves weight memory and roughly doubles matmul
+            # throughput on tensor cores
+            dtype = torch.float16
+            self.model = self.model.to(dtype)
+        else:
+            # On CPU, int8 dynamic quantization beats half precision:
+            # VNNI int8 GEMMs run ~4x faster than FP32 and weights
+            # shrink 4x. Fall back to bf16 if the backend lacks
+            # quantized Linear support.
+            dtype = None
+            try:
+                self.model = torch.quantization.quantize_dynamic(
+                    self.model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+            except Exception as e:
+                logger.warning("int8 quantization unavailable, using bf16: %s", e)
+                dtype = torch.bfloat16
+                self.model = self.model.to(dtype)
+
+        if torch.cuda.is_available():
+            self.model = self.model.to('cuda')
+
+        # TorchInductor fuses pointwise ops into the GEMMs and removes
+        # per-forward Python dispatch; the warmup forward runs the
+        # compilation now so the first real request isn't blocked by it
+        try:
+            compiled = torch.compile(self.model, mode='reduce-overhead', fullgraph=False)
+            warmup = self.tokenizer(
+                "warmup",
+                truncation=True,
+                max_length=512,
+                return_tensors='pt'
+            ).to(self.model.device)
+            with torch.inference_mode():
+                compiled(**warmup)
+            self.model = compiled
+        except Exception as e:
+            logger.warning("torch.compile disabled: %s", e)
+
+    def _load_onnx_model(self) -> bool:
+        """Try to load the model through ONNX Runtime (optimum).
+
+        ONNX Runtime applies its transformer graph optimizations (QKV,
+        attention and GELU fusion) at session creation; requires the
+        optional optimum[onnxruntime] dependency.
+        """
+        try:
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+
+            provider = (
+                'CUDAExecutionProvider' if torch.cuda.is_available()
+                else 'CPUExecutionProvider'
+            )
+            self.model = ORTModelForSequenceClassification.from_pretrained(
+                settings.MODEL_NAME,
+                export=True,
+                provider=provider
+            )
+            return True
+        except Exception as e:
+            logger.warning("ONNX Runtime unavailable, using PyTorch: %s", e)
+            return False
     
+    async def start_batcher(self):
+        """Start the background task that micro-batches predictions."""
+        if self._batch_task is None:
+            self._batch_queue = asyncio.Queue()
+            self._batch_task = asyncio.create_task(self._batch_worker())
+
+    async def stop_batcher(self):
+        """Stop the micro-batching task."""
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+            try:
+                await self._batch_task
+            except asyncio.CancelledError:
+                pass
+            self._batch_task = None
+            self._batch_queue = None
+
+    def analyze_batch(self, texts: List[str]) -> List[Dict]:
+        """Run the classifier on a batch of texts.
+
+        Tokenizes the whole batch once with the fast tokenizer and calls
+        the model directly; the pipeline wrapper re-tokenized per call
+        and added Python-side dispatch on every request. Rows are grouped
+        by padding bucket and run as one forward pass per bucket, so
+        short texts in a mixed batch aren't padded out to the longest.
+        """
+        encoding = self.tokenizer(texts, truncation=True, max_length=512)
+        pad_id = self.tokenizer.pad_token_id or 0
+
+        # Group row indices by the fixed bucket their token count lands in
+        buckets: Dict[int, List[int]] = {}
+        for i, ids in enumerate(encoding['input_ids']):
+            bucket = next((b for b in LENGTH_BUCKETS if b >= len(ids)), LENGTH_BUCKETS[-1])
+            buckets.setdefault(bucket, []).append(i)
+
+        id2label = self.model.config.id2label
+        results: List[Dict] = [None] * len(texts)
+        for bucket, indices in buckets.items():
+            features = {
+                name: torch.tensor([
+                    rows[i] + [pad_id if name == 'input_ids' else 0] * (bucket - len(rows[i]))
+                    for i in indices
+                ]).to(self.model.device)
+                for name, rows in encoding.items()
+            }
+
+            # inference_mode skips autograd bookkeeping entirely
+            with torch.inference_mode():
+                logits = self.model(**features).logits
+                probs = torch.softmax(logits.float(), dim=-1)
+
+            for i, row in zip(indices, probs):
+                idx = int(row.argmax())
+                results[i] = {'label': id2label[idx], 'score': float(row[idx])}
+        return results
+
+    async def _batch_worker(self):
+        """Drain queued predictions into batched pipeline calls.
+
+        Waits up to MODEL_BATCH_TIMEOUT_MS after the first queued item to
+        collect up to MODEL_BATCH_SIZE texts; transformer throughput grows
+        substantially with batch size, so concurrent /analyze requests
+        share one forward pass.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._batch_queue.get()]
+
+            # Drain whatever is already queued without paying for timers
+            while len(batch) < settings.MODEL_BATCH_SIZE:
+                try:
+                    batch.append(self._batch_queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            # Then wait out the flush window for stragglers
+            deadline = loop.time() + settings.MODEL_BATCH_TIMEOUT_MS / 1000
+            while len(batch) < settings.MODEL_BATCH_SIZE:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(
+                        self._batch_queue.get(), timeout=remaining
+                    ))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                predictions = self.analyze_batch([text for text, _ in batch])
+                for (_, future), prediction in zip(batch, predictions):
+                    if not future.done():
+                        future.set_result(prediction)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    async def _predict(self, text: str) -> Dict:
+        """Get a model prediction, going through the batcher if running."""
+        if self._batch_queue is None:
+            return self.analyze_batch([text])[0]
+
+        future = asyncio.get_running_loop().create_future()
+        await self._batch_queue.put((text, future))
+        return await future
+
     def _sanitize_text(self, text: str) -> str:
         """Sanitize input text to prevent XSS and other attacks."""
-        if not text or not isinstance(text, str):
+        # Callers pass strings decoded from JSON; no isinstance check on
+        # the hot path
+        if not text:
             return ""
-        
-        # Remove potentially dangerous HTML/script tags
-        text = re.sub(r'<[^>]*>', '', text)
-        text = re.sub(r'javascript:', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'data:', '', text, flags=re.IGNORECASE)
-        
-        # Limit text length
-        text = text[:10000]  # Max 10KB
-        
-        # Basic text cleaning
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
+
+        # Strip dangerous HTML/script fragments, cap at 10KB, collapse
+        # whitespace
+        text = self._TAG_RE.sub('', text)[:10000]
+        return self._WS_RE.sub(' ', text).strip()
     
     def _detect_suspicious_patterns(self, text: str) -> Tuple[bool, List[str]]:
-        """Detect suspicious patterns and keywords in text."""
-        text_lower = text.lower()
+        """Detect suspicious patterns and keywords in text.
+
+        All scans run case-insensitively on the original text, so no
+        lowered 10KB copy is allocated per request.
+        """
         detected_patterns = []
+
+        # Check for suspicious keywords (one pass, deduplicated so each
+        # keyword is reported once like the old per-keyword scan)
+        seen_keywords = dict.fromkeys(
+            match.group(1).lower() for match in self._keyword_pattern.finditer(text)
+        )
+        for keyword in seen_keywords:
+            detected_patterns.append(f"keyword_match:{keyword}")
         
-        # Check for suspicious keywords
-        for keyword in self.suspicious_keywords:
-            if keyword in text_lower:
-                detected_patterns.append(f"keyword_match:{keyword}")
-        
-        # Check for suspicious patterns
-        for pattern in self.suspicious_patterns:
-            matches = re.findall(pattern, text_lower)
-            if matches:
-                detected_patterns.append(f"pattern_match:{pattern}")
+        # Check for suspicious patterns (search is enough: only presence
+        # matters, and IGNORECASE spares a second lowered copy)
+        for raw_pattern, compiled in self.suspicious_patterns:
+            if compiled.search(text):
+                detected_patterns.append(f"pattern_match:{raw_pattern}")
         
         return len(detected_patterns) > 0, detected_patterns
     
@@ -135,11 +372,43 @@ class FakeNewsDetector:
                 "reason": "invalid_input"
             }
         
+        # Fingerprint once: the digest serves as the cache key and the
+        # in-flight dedup key
+        cache_key = cache.model_prediction_key(sanitized_text)
+
         # Check cache first
-        cached_result = await cache.get_model_prediction(sanitized_text)
+        cached_result = await cache.get_model_prediction(cache_key)
         if cached_result:
             return cached_result
-        
+
+        # Coalesce concurrent identical requests: the first caller runs
+        # the analysis, later ones await the same future
+        existing = self._inflight.get(cache_key)
+        if existing is not None:
+            return await asyncio.shield(existing)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            result = await self._analyze_uncached(sanitized_text, cache_key)
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieve the exception ourselves: with no coalesced waiters
+            # it would otherwise be logged as never retrieved
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(cache_key, None)
+            # If the owning task was cancelled the future is still
+            # pending; cancel it so coalesced waiters don't hang forever
+            if not future.done():
+                future.cancel()
+
+    async def _analyze_uncached(self, sanitized_text: str, cache_key: str) -> Dict:
+        """Run the full analysis for a cache-missed text."""
         try:
             # Ensure model is loaded
             await self.load_model()
@@ -147,13 +416,17 @@ class FakeNewsDetector:
             if not self._model_loaded:
                 # Fallback to pattern-based detection
                 return await self._fallback_analysis(sanitized_text)
-            
-            # Get model prediction
-            model_result = self.pipeline(sanitized_text, truncation=True, max_length=512)
-            
+
+            # Trivial inputs skip the transformer forward pass
+            if len(sanitized_text) < MIN_MODEL_TEXT_LENGTH:
+                return await self._fallback_analysis(sanitized_text)
+
+            # Get model prediction (micro-batched with concurrent requests)
+            prediction = await self._predict(sanitized_text[:MAX_MODEL_TEXT_CHARS])
+
             # Extract model score (assuming binary classification: fake vs real)
-            model_score = model_result[0]['score']
-            if model_result[0]['label'] == 'LABEL_0':  # Assuming LABEL_0 is real
+            model_score = prediction['score']
+            if prediction['label'] == 'LABEL_0':  # Assuming LABEL_0 is real
                 model_score = 1 - model_score
             
             # Detect suspicious patterns
@@ -184,12 +457,12 @@ class FakeNewsDetector:
             }
             
             # Cache the result
-            await cache.set_model_prediction(sanitized_text, result)
+            await cache.set_model_prediction(cache_key, result)
             
             return result
             
-        except Exception as e:
-            print(f"Model analysis error: {e}")
+        except Exception:
+            logger.exception("Model analysis error")
             # Fallback to pattern-based detection
             return await self._fallback_analysis(sanitized_text)
     
@@ -10,6 +10,7 @@ import subprocess
 import time
 import asyncio
 import httpx
+from importlib.metadata import distribution, PackageNotFoundError
 from pathlib import Path
 
 def check_python_version():
@@ -24,17 +25,20 @@ def check_python_version():
 def check_dependencies():
     """Check if required packages are installed."""
     required_packages = [
-        'fastapi', 'uvicorn', 'redis', 'httpx', 
-        'transformers', 'torch', 'beautifulsoup4'
+        'fastapi', 'uvicorn', 'uvloop', 'httptools', 'slowapi',
+        'redis', 'httpx', 'transformers', 'torch',
+        'blake3', 'orjson', 'msgspec', 'selectolax', 'cachetools'
     ]
     
     missing_packages = []
-    
+
+    # Check installed metadata instead of importing; importing torch or
+    # transformers just to verify presence costs seconds and hundreds of MB
     for package in required_packages:
         try:
-            __import__(package.replace('-', '_'))
+            distribution(package)
             print(f"✅ {package}")
-        except ImportError:
+        except PackageNotFoundError:
             missing_packages.append(package)
             print(f"❌ {package} (missing)")
     
@@ -118,7 +122,11 @@ def start_redis_docker():
 async def test_backend():
     """Test if the backend is responding."""
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
+        async with httpx.AsyncClient(
+            timeout=5.0,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=20)
+        ) as client:
             response = await client.get("http://localhost:8000/health")
             if response.status_code == 200:
                 print("✅ Backend is responding")
@@ -131,45 +139,16 @@ async def test_backend():
         return False
 
 def start_backend():
-    """Start the backend server."""
+    """Start the backend server, replacing this process."""
     print("🚀 Starting Fake News Detection Backend...")
-    
-    try:
-        # Start the backend in a subprocess
-        process = subprocess.Popen([
-            sys.executable, 'app.py'
-        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        
-        # Wait a bit for startup
-        time.sleep(5)
-        
-        # Check if process is still running
-        if process.poll() is None:
-            print("✅ Backend started successfully")
-            print("   URL: http://localhost:8000")
-            print("   Health: http://localhost:8000/health")
-            print("   Docs: http://localhost:8000/docs")
-            print("\n   Press Ctrl+C to stop the backend")
-            
-            try:
-                process.wait()
-            except KeyboardInterrupt:
-                print("\n🛑 Stopping backend...")
-                process.terminate()
-                process.wait()
-                print("✅ Backend stopped")
-        else:
-            stdout, stderr = process.communicate()
-            print("❌ Backend failed to start")
-            print("STDOUT:", stdout.decode())
-            print("STDERR:", stderr.decode())
-            return False
-            
-    except Exception as e:
-        print(f"❌ Failed to start backend: {e}")
-        return False
-    
-    return True
+    print("   URL: http://localhost:8000")
+    print("   Health: http://localhost:8000/health")
+    print("   Docs: http://localhost:8000/docs")
+    print("\n   Press Ctrl+C to stop the backend")
+
+    # exec replaces the dev script with the server in place: no child
+    # process holding RAM, no stdout/stderr pipes that can deadlock
+    os.execvp(sys.executable, [sys.executable, 'app.py'])
 
 def main():
     """Main startup function."""
@@ -206,10 +185,8 @@ def main():
         return 0
     
     print("\n🚀 Starting backend...")
-    if start_backend():
-        return 0
-    else:
-        return 1
+    start_backend()  # Does not return: the process becomes the server
+    return 0
 
 if __name__ == "__main__":
     try: